@@ -23,15 +23,20 @@ SOFTWARE.
 import csv
 import datetime
 import enum
+import functools
 import json
 import sys
 import pathlib
 import typing
 import collections.abc as colabc
 import asyncio
+import queue
+import threading
+import orjson
 from util.plugin_loader import PluginLoader
 from util.artifact_utils import ArtifactResult, ArtifactSpec, ReportPresentation, LogFunction, ArtifactStorage
 from util.fs_utils import sanitize_filename, ArtifactFileSystemStorage
+from util.profile_folder_protocols import BrowserProfileProtocol
 
 from ccl_chromium_reader import ChromiumProfileFolder
 from ccl_mozilla_reader import MozillaProfileFolder
@@ -41,6 +46,9 @@ __description__ = "an open plugin framework for parsing website/webapp artifacts
 __contact__ = "Alex Caithness"
 
 PLUGIN_PATH = pathlib.Path(__file__).resolve().parent / pathlib.Path("plugins")
+WORKER_THREAD_COUNT = 4
+LOG_BUFFER_SIZE = 1 << 16
+JSON_DUMP_OPTIONS = orjson.OPT_NON_STR_KEYS
 
 BANNER = """
 ╔╦╗┬┌─┐┌┬┐┌─┐┬─┐            
@@ -62,6 +70,27 @@ class ExtendedEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+JSON_ENCODER = ExtendedEncoder()
+
+
+def encode_json(obj) -> bytes:
+    try:
+        return orjson.dumps(obj, default=JSON_ENCODER.default, option=JSON_DUMP_OPTIONS)
+    except orjson.JSONEncodeError:
+        # orjson can't encode everything the standard library can (e.g., integers wider than 64 bits)
+        return JSON_ENCODER.encode(obj).encode("utf-8")
+
+
+def _resolve_future(future: asyncio.Future, result, exception: typing.Optional[Exception]):
+    # called on the event loop thread from a worker; the future will already be cancelled if run_all was exited
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+
+
 class BrowserType(enum.Enum):
     chromium = 1
     mozilla = 2
@@ -115,24 +144,85 @@ class MisterSkinnylegs:
             case _:
                 raise NotImplementedError(f"Browser type {self._browser_type} not supported")
 
-    async def _run_artifact(self, spec: ArtifactSpec):
-        # with ChromiumProfileFolder(self._profile_folder_path, cache_folder=self._cache_folder_path) as profile:
-        with self._make_profile() as profile:
-            result = spec.function(profile, self._log_callback, self._storage_maker_func(spec))
-            return spec, {
-                "artifact_service": spec.service,
-                "artifact_name": spec.name,
-                "artifact_version": spec.version,
-                "artifact_description": spec.description,
-                "result": result.result}
+    def _run_artifact(self, spec: ArtifactSpec, profile: BrowserProfileProtocol):
+        result = spec.function(profile, self._log_callback, self._storage_maker_func(spec))
+        return spec, {
+            "artifact_service": spec.service,
+            "artifact_name": spec.name,
+            "artifact_version": spec.version,
+            "artifact_description": spec.description,
+            "result": result.result}
+
+    def _artifact_worker(self, work_queue: queue.SimpleQueue, loop: asyncio.AbstractEventLoop):
+        # Runs on its own thread. The profile is opened (and closed) on this thread as the underlying sqlite
+        # connections can only be used on the thread which created them.
+        try:
+            profile = self._make_profile()
+        except Exception as ex:
+            # nothing can be run without the profile, so fail the remaining artifacts rather than leaving them
+            # waiting forever
+            while (work_item := work_queue.get()) is not None:
+                spec, future = work_item
+                loop.call_soon_threadsafe(_resolve_future, future, None, ex)
+            return
+
+        with profile:
+            while (work_item := work_queue.get()) is not None:
+                spec, future = work_item
+                try:
+                    result = self._run_artifact(spec, profile)
+                except Exception as ex:
+                    loop.call_soon_threadsafe(_resolve_future, future, None, ex)
+                else:
+                    loop.call_soon_threadsafe(_resolve_future, future, result, None)
 
     async def run_all(self):
         """
-        Async generator function that runs all loaded plugins against the profile folder provided to the constructor
+        Async generator function that runs all loaded plugins against the profile folder provided to the constructor.
+        Artifacts are run concurrently on a small pool of worker threads; each worker opens the profile once and
+        shares it between all the artifacts it processes so that the underlying data stores are only opened and
+        indexed once per worker.
         """
-        tasks = (self._run_artifact(spec) for spec, path in self.artifacts)
-        for coro in asyncio.as_completed(tasks):
-            yield await coro
+        loop = asyncio.get_running_loop()
+        work_queue = queue.SimpleQueue()
+        futures = []
+        for spec, path in self.artifacts:
+            future = loop.create_future()
+            futures.append(future)
+            work_queue.put((spec, future))
+
+        worker_count = min(WORKER_THREAD_COUNT, len(futures))
+        for _ in range(worker_count):
+            work_queue.put(None)  # one sentinel for each worker
+
+        workers = [asyncio.create_task(asyncio.to_thread(self._artifact_worker, work_queue, loop))
+                   for _ in range(worker_count)]
+        try:
+            for coro in asyncio.as_completed(futures):
+                yield await coro
+        finally:
+            # if we're leaving early (an artifact raised, or we were cancelled) stop the workers picking up any
+            # more artifacts; only the artifacts already running need to be waited for.
+            sentinel_count = 0
+            while True:
+                try:
+                    work_item = work_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if work_item is None:
+                    sentinel_count += 1
+                else:
+                    work_item[1].cancel()
+            for _ in range(sentinel_count):
+                work_queue.put(None)
+
+            for future in futures:
+                if not future.done():
+                    future.cancel()
+                elif not future.cancelled():
+                    future.exception()  # mark as retrieved; only the first failure is raised
+
+            await asyncio.gather(*workers)
 
     async def run_one(self, artifact_name: str):
         """
@@ -140,8 +230,12 @@ class MisterSkinnylegs:
         :param artifact_name:
         """
         spec, path = self._plugin_loader[artifact_name]
-        result = self._run_artifact(spec)
-        return spec, result
+
+        def run_with_own_profile():
+            with self._make_profile() as profile:
+                return self._run_artifact(spec, profile)
+
+        return await asyncio.to_thread(run_with_own_profile)
 
     @property
     def artifacts(self) -> colabc.Iterable[tuple[ArtifactSpec, pathlib.Path]]:
@@ -162,7 +256,7 @@ class MisterSkinnylegs:
 
 class SimpleLog:
     """
-    A simple log class designed to be passed around.
+    A simple log class designed to be passed around. Messages may be logged from multiple threads.
     """
 
     def __init__(self, out_path: pathlib.Path):
@@ -171,7 +265,9 @@ class SimpleLog:
 
         :param out_path: File path for the log file. Must not already exist.
         """
-        self._f = out_path.open("xt", encoding="utf-8")
+        self._f = out_path.open("xt", encoding="utf-8", buffering=LOG_BUFFER_SIZE)
+        self._stdout_encoding = sys.stdout.encoding
+        self._lock = threading.Lock()
 
     def log_message(self, message: str) -> None:
         """
@@ -181,10 +277,14 @@ class SimpleLog:
         """
         caller_name = f"{sys._getframemodulename(1)}.{sys._getframe(1).f_code.co_name}"
         formatted_message = f"{datetime.datetime.now()}\t{caller_name}\t{message.replace('\n', '\n\t')}"
-        self._f.write(formatted_message)
-        self._f.write("\n")
-
-        print(formatted_message.encode(sys.stdout.encoding, "replace").decode(sys.stdout.encoding))
+        # artifacts log from several worker threads, so keep each message together in the file and on the console
+        with self._lock:
+            self._f.write(formatted_message + "\n")
+            try:
+                print(formatted_message)
+            except UnicodeEncodeError:
+                # only pay for the round-trip when the console can't represent the message
+                print(formatted_message.encode(self._stdout_encoding, "replace").decode(self._stdout_encoding))
 
     def close(self) -> None:
         """
@@ -211,6 +311,23 @@ def write_csv(csv_out: typing.TextIO, result: list):
     writer.writerows(result)
 
 
+def write_json(json_out: typing.BinaryIO, result: dict):
+    records = result["result"]
+    if not isinstance(records, list):
+        json_out.write(encode_json(result))
+        return
+
+    # encode the records one at a time so that the whole output is never held in memory as a single encoded blob
+    header = {k: v for k, v in result.items() if k != "result"}
+    json_out.write(encode_json(header)[:-1])  # trim the closing brace
+    json_out.write(b',"result":[')
+    for idx, rec in enumerate(records):
+        if idx:
+            json_out.write(b",")
+        json_out.write(encode_json(rec))
+    json_out.write(b"]}")
+
+
 async def main(
         profile_input_folder: pathlib.Path,
         report_output_folder: pathlib.Path,
@@ -233,13 +350,17 @@ async def main(
     log_file = SimpleLog(report_output_folder / f"log_{datetime.datetime.now():%Y%m%d_%H%M%S}.log")
     log = log_file.log_message
 
+    # service and artifact names are sanitized both for the storage folders and for the output files, and services
+    # are shared by several artifacts, so only work each one out once (the cache is safe to use from worker threads)
+    sanitize_name = functools.lru_cache(maxsize=None)(sanitize_filename)
+
     mr_sl = MisterSkinnylegs(
         PLUGIN_PATH,
         profile_input_folder,
         browser_type,
         lambda s: ArtifactFileSystemStorage(
-            report_output_folder / sanitize_filename(s.service),
-            sanitize_filename(s.name) + "_files"),
+            report_output_folder / sanitize_name(s.service),
+            sanitize_name(s.name) + "_files"),
         cache_folder=cache_folder,
         log_callback=log)
 
@@ -255,20 +376,23 @@ async def main(
     log("")
     log("Processing starting...")
 
+    service_out_dir_paths: dict[str, pathlib.Path] = {}
     async for spec, result in mr_sl.run_all():
         log(f"Results acquired for {spec.name}")
         if not result["result"]:
             log(f"{spec.name} had no results, skipping")
             continue
 
-        out_dir_path = report_output_folder / sanitize_filename(spec.service)
-        out_dir_path.mkdir(exist_ok=True)
-        out_file_path = out_dir_path / (sanitize_filename(spec.name) + ".json")
+        if (out_dir_path := service_out_dir_paths.get(spec.service)) is None:
+            out_dir_path = report_output_folder / sanitize_name(spec.service)
+            out_dir_path.mkdir(exist_ok=True)
+            service_out_dir_paths[spec.service] = out_dir_path
+        out_file_path = out_dir_path / (sanitize_name(spec.name) + ".json")
 
         log(f"Generating output at {out_file_path}")
 
-        with out_file_path.open("xt", encoding="utf-8") as out:
-            json.dump(result, out, cls=ExtendedEncoder)
+        with out_file_path.open("xb") as out:
+            write_json(out, result)
         if spec.presentation == ReportPresentation.table:
             csv_out_path = out_file_path.with_suffix(".csv")
             log(f"Generating csv output at {csv_out_path}")
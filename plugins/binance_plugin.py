@@ -13,7 +13,7 @@ def get_binance_userdetails(profile: BrowserProfileProtocol, log_func: LogFuncti
     results = []
     
     for cache_rec in profile.iterate_cache(url=USER_DETAILS_PATTERN):
-        cache_data = json.loads(cache_rec.data.decode("utf-8"))
+        cache_data = json.loads(cache_rec.data)
     
         data = cache_data.get("data", {})
         address_full = data['billingAddr1'], data['billingCity'], data['billingState'], data['billingPostalCode']
@@ -35,7 +35,7 @@ def get_binance_balances(profile: BrowserProfileProtocol, log_func: LogFunction,
     results = []
 
     for cache_rec in profile.iterate_cache(url=BALANCES_PATTERN):
-        cache_data = json.loads(cache_rec.data.decode("utf-8"))
+        cache_data = json.loads(cache_rec.data)
 
         data = cache_data.get('data')
 
@@ -1,14 +1,21 @@
 import json
 import re
-from datetime import datetime
+import datetime
 
 from util.artifact_utils import ArtifactResult, ArtifactSpec, LogFunction, ReportPresentation, ArtifactStorage
 from util.profile_folder_protocols import BrowserProfileProtocol
 
 
-CONVERSATION_API_URL_PATTERN = re.compile(r"chatgpt.*?\.[A-z]{2,3}/backend-api/conversations\?offset")
-CONVERSATION_URL_PATTERN = re.compile(r"https?://.*chatgpt.*?\.[A-z]{2,3}/c/[0-9a-fA-F\-]{36}$")
-USER_DETAILS_API_URL_PATTERN = re.compile(r"chatgpt.*?\.[A-z]{2,3}/backend-api/me")
+CONVERSATION_API_URL_PATTERN = re.compile(r"chatgpt.*?\.[A-z]{2,3}/backend-api/conversations\?offset", re.ASCII)
+CONVERSATION_URL_PATTERN = re.compile(
+    r"https?://.*chatgpt.*?\.[A-z]{2,3}/c/(?P<id>[0-9a-fA-F\-]{36})(?:[/?#]|$)", re.ASCII)
+USER_DETAILS_API_URL_PATTERN = re.compile(r"chatgpt.*?\.[A-z]{2,3}/backend-api/me", re.ASCII)
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def parse_unix_seconds(seconds):
+    return EPOCH + datetime.timedelta(seconds=seconds)
 
 
 def get_chatgpt_chatinfo(profile: BrowserProfileProtocol, log_func: LogFunction, storage: ArtifactStorage) -> ArtifactResult:
@@ -19,7 +26,7 @@ def get_chatgpt_chatinfo(profile: BrowserProfileProtocol, log_func: LogFunction,
             log_func(f"Error: ChatGPT chat information cache file is size is zero! Skipping file.")
             continue
             
-        cache_data = json.loads(cache_rec.data.decode("utf-8"))
+        cache_data = json.loads(cache_rec.data)
     
         items = cache_data.get("items", {})
         for chat_item in items:
@@ -29,8 +36,8 @@ def get_chatgpt_chatinfo(profile: BrowserProfileProtocol, log_func: LogFunction,
             update_time = chat_item.get("update_time")
 
             result = { 
-                "ID": str(chat_id),
-                "Title": str(title),
+                "ID": chat_id,
+                "Title": title,
                 "History Timestamp": "N/A",
                 "Chat Created Time": create_time,
                 "Chat Updated Time": update_time,
@@ -44,7 +51,7 @@ def get_chatgpt_chatinfo(profile: BrowserProfileProtocol, log_func: LogFunction,
     for history_rec in profile.iterate_history_records(url=CONVERSATION_URL_PATTERN):
         results.append(
             {
-                "ID": history_rec.url[-36:],
+                "ID": CONVERSATION_URL_PATTERN.search(history_rec.url).group("id"),
                 "Title": history_rec.title,
                 "History Timestamp": history_rec.visit_time,
                 "Chat Created Time": "Unknown",
@@ -66,7 +73,7 @@ def get_chatgpt_userinfo(profile: BrowserProfileProtocol, log_func: LogFunction,
             log_func(f"Error: ChatGPT user information cache file is size is zero! Skipping file.")
             continue
             
-        cache_data = json.loads(cache_rec.data.decode("utf-8"))
+        cache_data = json.loads(cache_rec.data)
 
         name = cache_data.get("name")
         email = cache_data.get("email")
@@ -76,13 +83,13 @@ def get_chatgpt_userinfo(profile: BrowserProfileProtocol, log_func: LogFunction,
         if created is None:
             standard_timestamp = None
         else:
-            standard_timestamp = datetime.fromtimestamp(created)
+            standard_timestamp = parse_unix_seconds(created)
     
         result = {
-            "Created": str(standard_timestamp),
+            "Created": standard_timestamp,
             "Name": name,
             "Email": email,
-            "Phone Number": str(phone_number),
+            "Phone Number": phone_number,
             "Source": "Cache",
             "Data Location": str(cache_rec.data_location)
             }
@@ -97,7 +104,7 @@ __artifacts__ = (
         "ChatGPT",
         "ChatGPT Chat Information",
         "Recovers ChatGPT chat information from History and Cache",
-        "0.2",
+        "0.3",
         get_chatgpt_chatinfo,
         ReportPresentation.table
     ),
@@ -105,7 +112,7 @@ __artifacts__ = (
         "ChatGPT",
         "ChatGPT User Information",
         "Recovers ChatGPT user information from Cache",
-        "0.2",
+        "0.3",
         get_chatgpt_userinfo,
         ReportPresentation.table
     ),
@@ -21,7 +21,7 @@ def get_coinbase_paymentmethods(profile: BrowserProfileProtocol, log_func: LogFu
     results = []
 
     for cache_rec in profile.iterate_cache(url=PAYMENT_METHODS_PATTERN):
-        cache_data = json.loads(cache_rec.data.decode("utf-8"))
+        cache_data = json.loads(cache_rec.data)
     
         data = cache_data.get("data", {})
         viewer = data.get("viewer", {})
@@ -59,7 +59,7 @@ def get_coinbase_userdetails(profile: BrowserProfileProtocol, log_func: LogFunct
     results = []
 
     for cache_rec in profile.iterate_cache(url=USER_DETAILS_PATTERN):
-        cache_data = json.loads(cache_rec.data.decode("utf-8"))
+        cache_data = json.loads(cache_rec.data)
     
         data = cache_data.get("data", {})
         viewer = data.get("viewer", {})
@@ -93,7 +93,7 @@ def get_coinbase_balances(profile: BrowserProfileProtocol, log_func: LogFunction
 
     for cache_rec in profile.iterate_cache(url=BALANCES_PATTERN):
         
-        cache_data = json.loads(cache_rec.data.decode("utf-8"))
+        cache_data = json.loads(cache_rec.data)
     
         data = cache_data.get("data")
         viewer = data.get("viewer")
@@ -203,7 +203,7 @@ def get_coinbase_transactions(profile: BrowserProfileProtocol, log_func: LogFunc
 
     for url_pattern in TRANSACTION_PATTERNS:
         for cache_rec in profile.iterate_cache(url=url_pattern):
-            cache_data = json.loads(cache_rec.data.decode("utf-8"))
+            cache_data = json.loads(cache_rec.data)
 
             if "viewer" in cache_data.get("data", {}):
                 data_node = cache_data["data"].get("viewer", {}).get("accountByUuidV2", {})
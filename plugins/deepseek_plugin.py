@@ -22,7 +22,7 @@ def get_deepseek_userinfo(profile: BrowserProfileProtocol, log_func: LogFunction
             log_func(f"Error: DeepSeek User Information cache file is size is zero! Skipping file.")
             continue
             
-        cache_data = json.loads(cache_rec.data.decode("utf-8"))
+        cache_data = json.loads(cache_rec.data)
 
         data = cache_data.get("data")
         email = data.get("email")
@@ -60,7 +60,7 @@ def get_deepseek_chat_sessions(profile: BrowserProfileProtocol, log_func: LogFun
             log_func(f"Error: DeepSeek Chat Session information cache file is size is zero! Skipping file.")
             continue
     
-        cache_data = json.loads(cache_rec.data.decode("utf-8"))
+        cache_data = json.loads(cache_rec.data)
 
         data = cache_data.get('data')
         biz_data = data.get("biz_data")
@@ -123,7 +123,7 @@ def get_deepseek_chat_messages(profile: BrowserProfileProtocol, log_func: LogFun
             log_func(f"Error: DeepSeek Chat Message information cache file is size is zero! Skipping file.")
             continue
         
-        cache_data = json.loads(cache_rec.data.decode("utf-8"))
+        cache_data = json.loads(cache_rec.data)
 
         data = cache_data.get('data')
         biz_data = data.get("biz_data")
@@ -11,7 +11,7 @@ def get_messages(profile: BrowserProfileProtocol, log_func: LogFunction, storage
     results = []
 
     for cache_rec in profile.iterate_cache(url=re.compile(r"discord.com/api/v\d{1,2}/channels/\d+?/messages")):
-        msg_list = json.loads(cache_rec.data.decode("utf-8"))
+        msg_list = json.loads(cache_rec.data)
         for msg in msg_list:
             attachments = "\n".join(
                 f"ID={x["id"]}; filename='{x["filename"]}'; url='{x["url"]}'" for x in msg["attachments"])
@@ -1,38 +1,56 @@
 import re
 import datetime
+import collections
+import concurrent.futures
 
-from util.artifact_utils import ArtifactResult, ArtifactSpec, LogFunction, ReportPresentation, ArtifactStorage
+from util.artifact_utils import ArtifactResult, ArtifactSpec, LogFunction, ReportPresentation, ArtifactStorage, \
+    ArtifactStorageBinaryStream
 from ccl_chromium_reader import ChromiumProfileFolder
 from util.profile_folder_protocols import BrowserProfileProtocol
 
-FOLDERS_URL_PATTERN = re.compile(r"^https://drive.google.com/drive/folders/")
-FILES_URL_PATTERN = re.compile(r"^https://drive.google.com/file/d/")
-DOCS_URL_PATTERN = re.compile(r"^https://docs.google.com/(?P<service>\w+?)/d/")
+# a single pattern which classifies file listing urls by which of the named groups participates in the match
+FILE_LISTING_URL_PATTERN = re.compile(
+    r"^https://(?:drive\.google\.com/drive/(?P<folders>folders)/"
+    r"|drive\.google\.com/(?P<file>file)/d/"
+    r"|docs\.google\.com/(?P<docs>\w+?)/d/)",
+    re.ASCII)
+# literal prefixes used to cheaply reject urls before falling through to the pattern above
+FILE_LISTING_URL_PREFIXES = (
+    "https://drive.google.com/drive/folders/",
+    "https://drive.google.com/file/d/",
+    "https://docs.google.com/"
+)
+
+THUMBNAIL_URL_PATTERN = re.compile(
+    r"(?:googleusercontent\.com/fife|drive\.fife\.usercontent\.google\.com/u).+w\d{2,4}-h\d{2,4}",
+    re.ASCII)
+CONTENT_DISPOSITION_FILENAME_PATTERN = re.compile(r"filename=\"(.+?)\"")
 
-THUMBNAIL_URL_PATTERN_1 = re.compile(r"googleusercontent\.com/fife.+w\d{2,4}-h\d{2,4}")
-THUMBNAIL_URL_PATTERN_2 = re.compile(r"drive.fife.usercontent.google.com/u.+w\d{2,4}-h\d{2,4}")
+EXPORT_WORKER_COUNT = 8
+MAX_PENDING_EXPORTS = EXPORT_WORKER_COUNT * 2
 
+# The BrowserProfileProtocol iterators (iterate_history_records, iterate_cache, iter_session_storage) make no
+# guarantee about the order in which records are returned, so each artifact here sorts its own results by time.
+# Records with no time are sorted first using UNKNOWN_TIME_SORT_KEY.
 EPOCH = datetime.datetime(1970, 1, 1)
+UNKNOWN_TIME_SORT_KEY = datetime.datetime(1601, 1, 1)
 
 
 def parse_unix_ms(ms):
     return EPOCH + datetime.timedelta(milliseconds=ms)
 
 
-def _matches_file_listing_pattern(s: str):
-    return bool(FOLDERS_URL_PATTERN.match(s) or FILES_URL_PATTERN.match(s) or DOCS_URL_PATTERN.match(s))
-
-
-def _matches_thumbnail_pattern(s: str):
-    return bool(THUMBNAIL_URL_PATTERN_1.search(s) or THUMBNAIL_URL_PATTERN_2.search(s))
+def _is_file_listing_url(s: str):
+    return s.startswith(FILE_LISTING_URL_PREFIXES) and FILE_LISTING_URL_PATTERN.match(s) is not None
 
 
 def folders_and_files(
         profile: BrowserProfileProtocol, log_func: LogFunction, storage: ArtifactStorage) -> ArtifactResult:
     results = []
 
-    for history_rec in profile.iterate_history_records(url=_matches_file_listing_pattern):
-        if FOLDERS_URL_PATTERN.match(history_rec.url):
+    for history_rec in profile.iterate_history_records(url=_is_file_listing_url):
+        url_match = FILE_LISTING_URL_PATTERN.match(history_rec.url)
+        if url_match.group("folders"):
             # page title will be structured as: "My Drive - Google Drive"
             folder_name = history_rec.title.rsplit(" - ", 1)[0]
             results.append({
@@ -42,7 +60,7 @@ def folders_and_files(
                 "url": history_rec.url,
                 "timestamp": history_rec.visit_time
             })
-        elif FILES_URL_PATTERN.match(history_rec.url):
+        elif url_match.group("file"):
             # page title will be structured as: "screenshot.png - Google Drive"
             file_name = history_rec.title.rsplit(" - ", 1)[0]
             results.append({
@@ -52,10 +70,10 @@ def folders_and_files(
                 "url": history_rec.url,
                 "timestamp": history_rec.visit_time
             })
-        elif docs_match := DOCS_URL_PATTERN.match(history_rec.url):
+        elif url_match.group("docs"):
             # page title will be structured as: "Untitled spreadsheet - Google Sheets"
             doc_name = history_rec.title.rsplit(" - ", 1)[0]
-            service = docs_match.group("service").title()
+            service = url_match.group("docs").title()
             results.append({
                 "id": history_rec.record_location,
                 "type": service,
@@ -68,30 +86,49 @@ def folders_and_files(
     return ArtifactResult(results)
 
 
+def _write_and_close(file_out: ArtifactStorageBinaryStream, data: bytes) -> None:
+    with file_out:
+        file_out.write(data)
+
+
 def thumbnails(profile: BrowserProfileProtocol, log_func: LogFunction, storage: ArtifactStorage) -> ArtifactResult:
     has_response_time = isinstance(profile, ChromiumProfileFolder)
     results = []
-    for idx, rec in enumerate(profile.iterate_cache(url=_matches_thumbnail_pattern)):
-        if rec.metadata:
-            content_disposition = rec.metadata.get_attribute("content-disposition")[0]
-            cache_filename = re.search(r"filename=\"(.+?)\"", content_disposition).group(1)
-            out_filename = f"{idx}_{cache_filename}"
-        else:
-            out_filename = f"{idx}_"
-
-        with storage.get_binary_stream(out_filename) as file_out:
-            file_out.write(rec.data)
-
-        log_func(f"Exporting thumbnail to: {file_out.get_file_location_reference()}")
-
-        results.append({
-            "url": rec.key.url,
-            "cache request time": rec.metadata.request_time if rec.metadata else None,
-            "cache response time": rec.metadata.response_time if has_response_time and rec.metadata else None,
-            "extracted file reference": file_out.get_file_location_reference()
-        })
-
-    results.sort(key=lambda x: x["cache request time"] or datetime.datetime(1601, 1, 1))
+    # each pending export holds on to its record's data until it is written, so limit how many can be waiting
+    pending_exports = collections.deque()
+
+    def complete_oldest_export():
+        result, export, file_out = pending_exports.popleft()
+        export.result()
+        result["extracted file reference"] = file_out.get_file_location_reference()
+        log_func(f"Exporting thumbnail to: {result['extracted file reference']}")
+        results.append(result)
+
+    # only the writes are handed to the pool; the storage object itself is only used from this thread
+    with concurrent.futures.ThreadPoolExecutor(max_workers=EXPORT_WORKER_COUNT) as executor:
+        for idx, rec in enumerate(profile.iterate_cache(url=THUMBNAIL_URL_PATTERN)):
+            if rec.metadata:
+                content_disposition = rec.metadata.get_attribute("content-disposition")[0]
+                cache_filename = CONTENT_DISPOSITION_FILENAME_PATTERN.search(content_disposition).group(1)
+                out_filename = f"{idx}_{cache_filename}"
+            else:
+                out_filename = f"{idx}_"
+
+            file_out = storage.get_binary_stream(out_filename)
+            result = {
+                "url": rec.key.url,
+                "cache request time": rec.metadata.request_time if rec.metadata else None,
+                "cache response time": rec.metadata.response_time if has_response_time and rec.metadata else None,
+                "extracted file reference": None
+            }
+            pending_exports.append((result, executor.submit(_write_and_close, file_out, rec.data), file_out))
+            if len(pending_exports) >= MAX_PENDING_EXPORTS:
+                complete_oldest_export()
+
+        while pending_exports:
+            complete_oldest_export()
+
+    results.sort(key=lambda x: x["cache request time"] or UNKNOWN_TIME_SORT_KEY)
 
     return ArtifactResult(results)
 
@@ -89,7 +89,7 @@ def _get_sharepoint_recent_files(profile: BrowserProfileProtocol, log_func: LogF
     for cache_record in profile.iterate_cache(url=RECENT_FILES_SHAREPOINT_URL_PATTERN):
         if not cache_record.data:
             continue
-        obj = json.loads(cache_record.data.decode("utf-8"))
+        obj = json.loads(cache_record.data)
 
         if "d" in obj:
             if "DeltaSync" in obj["d"]:
@@ -180,7 +180,7 @@ def _get_edgeworth_recent_files(profile: BrowserProfileProtocol, log_func: LogFu
             continue
 
         method = RECENT_FILES_EDGEWORTH_URL_PATTERN.search(cache_record.key.url).group("method")
-        obj = json.loads(cache_record.data.decode("utf-8"))
+        obj = json.loads(cache_record.data)
         files = obj.get("files", [])
 
         for file in files:
@@ -185,7 +185,7 @@ def get_messages(profile: BrowserProfileProtocol, log_func: LogFunction, storage
                     REDDIT_MATRIX_DOWNLOAD_PATTERN)))):
 
         if REDDIT_MATRIX_ROOMS_PATTERN.search(record.key.url):
-            obj = json.loads(record.data.decode("utf-8"))
+            obj = json.loads(record.data)
             process_room_endpoint(record.key.url, obj, messages_raw, display_name_lookup, str(record.data_location), log_func)
         elif REDDIT_MATRIX_SYNC_PATTERN.search(record.key.url) and record.data:
             try: